@@ -5,15 +5,189 @@ Comprehensive test runner for RAG chatbot debugging
 import unittest
 import sys
 import os
-from io import StringIO
+import importlib
+import re
+from collections import defaultdict, namedtuple
+from types import MappingProxyType
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BACKEND_DIR = os.path.dirname(TESTS_DIR)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# Report sections for discovered test modules, in order of system layers
+SUITE_NAMES = {
+    'test_course_search_tool': "1. CourseSearchTool Tests",
+    'test_ai_generator': "2. AIGenerator Tests",
+    'test_rag_system': "3. RAG System Tests",
+}
+
+
+# Markers that identify known issues in failure tracebacks, matched in one pass
+_ISSUE_MARKERS = re.compile(r"MAX_RESULTS|0 not greater than 0|specific topic|execute_calls|0 != 1")
+
+
+def _categorize_failure(traceback):
+    """Return the known issue category for a failure traceback, or None"""
+    markers = set(_ISSUE_MARKERS.findall(traceback))
+    if {"MAX_RESULTS", "0 not greater than 0"} <= markers:
+        return 'config'
+    if "specific topic" in markers:
+        return 'test'
+    if {"execute_calls", "0 != 1"} <= markers:
+        return 'mock'
+    return None
+
+
+# Issue descriptions for each failure category, shared read-only across failures
+KNOWN_ISSUES = {
+    'config': MappingProxyType({
+        'type': 'CRITICAL_CONFIG_ISSUE',
+        'component': 'Config',
+        'issue': 'MAX_RESULTS is set to 0',
+        'impact': 'Vector searches return 0 results, causing query failures',
+        'fix': 'Change MAX_RESULTS from 0 to 5 in config.py line 24',
+        'severity': 'HIGH'
+    }),
+    'test': MappingProxyType({
+        'type': 'TEST_ISSUE',
+        'component': 'CourseSearchTool Test',
+        'issue': 'Case sensitive string matching in test',
+        'impact': 'Test validation error, not system issue',
+        'fix': 'Update test to match actual output format',
+        'severity': 'LOW'
+    }),
+    'mock': MappingProxyType({
+        'type': 'TEST_MOCK_ISSUE',
+        'component': 'AIGenerator Test',
+        'issue': 'Mock tool execution not being called as expected',
+        'impact': 'Test design issue, may indicate real integration problem',
+        'fix': 'Fix mock setup or verify actual tool execution flow',
+        'severity': 'MEDIUM'
+    }),
+}
+
+# Report blocks for a single issue; critical issues also show their impact
+ISSUE_TEMPLATE = "\n{n}. Component: {component}\n   Issue: {issue}\n   Fix: {fix}"
+ISSUE_DETAIL_TEMPLATE = "\n{n}. Component: {component}\n   Issue: {issue}\n   Impact: {impact}\n   Fix: {fix}"
+
+
+# Picklable summary of a suite run, returned from worker processes
+SuiteResult = namedtuple('SuiteResult', ['name', 'testsRun', 'failures', 'errors'])
+
+# Runner output is discarded; only the failure tracebacks are analyzed.
+# Set VERBOSE=1 to stream per-test runner output to stderr instead, one class at a time.
+_VERBOSE = bool(os.environ.get('VERBOSE'))
+
+# Shared loader for discovery and per-class loading
+_LOADER = unittest.TestLoader()
+
 
-# Import test modules
-from test_course_search_tool import TestCourseSearchTool
-from test_ai_generator import TestAIGenerator, TestAIGeneratorIntegration
-from test_rag_system import TestRAGSystem, TestRAGSystemIntegration, TestRAGSystemRealConfigIssues
+def _load_tests(test_name):
+    """Build a fresh suite for a dotted 'module.TestClass' name"""
+    module_name, class_name = test_name.rsplit('.', 1)
+    test_class = getattr(importlib.import_module(module_name), class_name)
+    return _LOADER.loadTestsFromTestCase(test_class)
+
+
+def _flatten(suite):
+    """Yield the individual test cases of a nested test suite"""
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from _flatten(test)
+        else:
+            yield test
+
+
+def _test_module_name(test):
+    """Return the name of the test module a discovered test came from.
+
+    Tests whose class lives outside the tests directory are placeholders
+    created by unittest for a module that failed to load; their id ends
+    with the failing module's name.
+    """
+    module_name = type(test).__module__
+    module_file = getattr(sys.modules.get(module_name), '__file__', None)
+    if module_file and os.path.dirname(os.path.abspath(module_file)) == TESTS_DIR:
+        return module_name
+    return test.id().rsplit('.', 1)[-1]
+
+
+def _discover_suites():
+    """Discover test modules and group their TestCase classes into report sections.
+
+    Known modules keep their SUITE_NAMES section; any new test_*.py module is
+    appended as its own section so it runs without editing this file.
+    
+    Each section lists dotted 'module.TestClass' names for the worker processes.
+    Tests that cannot be reloaded by name, such as the placeholder discover()
+    returns for a module that failed to import, are kept as test objects and
+    run in this process so that their errors still reach the report.
+    """
+    classes_by_module = {}
+    top_suite = _LOADER.discover(TESTS_DIR, pattern='test_*.py')
+    for error in _LOADER.errors:
+        sys.stderr.write(error)
+    
+    for test in _flatten(top_suite):
+        test_class = type(test)
+        module_name = _test_module_name(test)
+        module = sys.modules.get(module_name)
+        if test_class.__module__ != module_name or getattr(module, test_class.__qualname__, None) is not test_class:
+            classes_by_module.setdefault(module_name, []).append(test)
+            continue
+        
+        class_name = f"{module_name}.{test_class.__qualname__}"
+        class_names = classes_by_module.setdefault(module_name, [])
+        if class_name not in class_names:
+            class_names.append(class_name)
+    
+    modules = [m for m in SUITE_NAMES if m in classes_by_module]
+    modules += sorted(m for m in classes_by_module if m not in SUITE_NAMES)
+    
+    test_suites = []
+    for index, module in enumerate(modules, 1):
+        suite_name = SUITE_NAMES.get(module, f"{index}. {module} Tests")
+        test_suites.append((suite_name, classes_by_module[module]))
+    return test_suites
+
+
+def _run_test_class(test_name):
+    """Run a single TestCase class in a worker process.
+
+    Test classes are passed as dotted names and re-imported here so that
+    no class objects need to be pickled across the process boundary.
+    """
+    return _run_tests(test_name, _load_tests(test_name))
+
+
+def _run_tests(test_name, tests):
+    """Run a test or suite and summarize its outcome as a SuiteResult"""
+    if _VERBOSE:
+        result = unittest.TextTestRunner(stream=sys.stderr, verbosity=2).run(tests)
+    else:
+        with open(os.devnull, 'w') as null:
+            result = unittest.TextTestRunner(stream=null, verbosity=0).run(tests)
+    
+    return SuiteResult(
+        name=test_name,
+        testsRun=result.testsRun,
+        failures=[(str(test), traceback) for test, traceback in result.failures],
+        errors=[(str(test), traceback) for test, traceback in result.errors]
+    )
+
+
+def _merge_results(suite_name, class_results):
+    """Combine per-class results into one suite result, keeping class order"""
+    return SuiteResult(
+        name=suite_name,
+        testsRun=sum(r.testsRun for r in class_results),
+        failures=[f for r in class_results for f in r.failures],
+        errors=[e for r in class_results for e in r.errors]
+    )
 
 
 class RAGSystemTestRunner:
@@ -21,44 +195,62 @@ class RAGSystemTestRunner:
     
     def __init__(self):
         self.issues_found = []
+        self.issues_by_severity = defaultdict(list)
         self.passed_tests = []
         self.failed_tests = []
     
     def run_all_tests(self):
         """Run all tests and collect results"""
-        print("=" * 80)
-        print("RAG CHATBOT DEBUGGING - COMPREHENSIVE TEST ANALYSIS")  
-        print("=" * 80)
-        print()
+        sys.stdout.write("\n".join([
+            "=" * 80,
+            "RAG CHATBOT DEBUGGING - COMPREHENSIVE TEST ANALYSIS",
+            "=" * 80,
+            ""
+        ]) + "\n")
+        sys.stdout.flush()
         
         # Test suites in order of system layers
-        test_suites = [
-            ("1. CourseSearchTool Tests", [TestCourseSearchTool]),
-            ("2. AIGenerator Tests", [TestAIGenerator, TestAIGeneratorIntegration]),
-            ("3. RAG System Tests", [TestRAGSystem, TestRAGSystemIntegration, TestRAGSystemRealConfigIssues])
-        ]
-        
-        for suite_name, test_classes in test_suites:
-            print(f"\n{suite_name}")
-            print("-" * len(suite_name))
-            
-            suite = unittest.TestSuite()
-            for test_class in test_classes:
-                tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
-                suite.addTest(tests)
-            
-            # Capture test output
-            stream = StringIO()
-            runner = unittest.TextTestRunner(stream=stream, verbosity=2)
-            result = runner.run(suite)
-            
-            # Analyze results
-            self._analyze_test_results(suite_name, result, stream.getvalue())
+        test_suites = _discover_suites()
+        
+        # Run every test class in parallel, leaving a couple of cores free.
+        # Classes get their own processes rather than threads because several
+        # of them patch the same module globals (e.g. rag_system.VectorStore).
+        # Tests that cannot be reloaded by name run here instead.
+        jobs = []
+        class_results = {}
+        for suite_index, (_, test_names) in enumerate(test_suites):
+            for class_index, test in enumerate(test_names):
+                if isinstance(test, str):
+                    jobs.append((suite_index, class_index, test))
+                else:
+                    class_results[(suite_index, class_index)] = _run_tests(str(test), test)
+        
+        workers = max(1, min(len(jobs), (os.cpu_count() or 2) - 2))
+        if _VERBOSE:
+            # One worker keeps the streamed per-test output in suite order
+            workers = 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_run_test_class, test_name): (suite_index, class_index)
+                for suite_index, class_index, test_name in jobs
+            }
+            for future in as_completed(futures):
+                class_results[futures[future]] = future.result()
+        
+        # Analyze results in the original suite order
+        for suite_index, (suite_name, test_names) in enumerate(test_suites):
+            result = _merge_results(suite_name, [
+                class_results[(suite_index, class_index)]
+                for class_index in range(len(test_names))
+            ])
+            print(f"\n{result.name}")
+            print("-" * len(result.name))
+            self._analyze_test_results(result.name, result)
         
         # Generate comprehensive report
         self._generate_report()
     
-    def _analyze_test_results(self, suite_name, result, output):
+    def _analyze_test_results(self, suite_name, result):
         """Analyze test results and categorize issues"""
         print(f"Tests run: {result.testsRun}, Failures: {len(result.failures)}, Errors: {len(result.errors)}")
         
@@ -67,117 +259,104 @@ class RAGSystemTestRunner:
             passed = result.testsRun - len(result.failures) - len(result.errors)
             self.passed_tests.append((suite_name, passed, result.testsRun))
         
+        # Nothing to categorize on an all-green suite
+        if not result.failures and not result.errors:
+            return
+        
+        # Reserve a slot for every failure and error up front
+        base = len(self.failed_tests)
+        self.failed_tests += [None] * (len(result.failures) + len(result.errors))
+        
         # Analyze failures
-        for test, traceback in result.failures:
+        for offset, (test, traceback) in enumerate(result.failures):
             test_name = str(test)
             
             # Categorize specific issues
-            if "MAX_RESULTS" in traceback and "0 not greater than 0" in traceback:
-                self.issues_found.append({
-                    'type': 'CRITICAL_CONFIG_ISSUE',
-                    'component': 'Config',
-                    'issue': 'MAX_RESULTS is set to 0',
-                    'impact': 'Vector searches return 0 results, causing query failures',
-                    'fix': 'Change MAX_RESULTS from 0 to 5 in config.py line 24',
-                    'severity': 'HIGH'
-                })
+            issue = KNOWN_ISSUES.get(_categorize_failure(traceback))
+            if issue:
+                self.issues_found.append(issue)
+                self.issues_by_severity[issue['severity']].append(issue)
             
-            elif "specific topic" in traceback:
-                self.issues_found.append({
-                    'type': 'TEST_ISSUE',
-                    'component': 'CourseSearchTool Test',
-                    'issue': 'Case sensitive string matching in test',
-                    'impact': 'Test validation error, not system issue',
-                    'fix': 'Update test to match actual output format',
-                    'severity': 'LOW'
-                })
-            
-            elif "execute_calls" in traceback and "0 != 1" in traceback:
-                self.issues_found.append({
-                    'type': 'TEST_MOCK_ISSUE',
-                    'component': 'AIGenerator Test',
-                    'issue': 'Mock tool execution not being called as expected',
-                    'impact': 'Test design issue, may indicate real integration problem',
-                    'fix': 'Fix mock setup or verify actual tool execution flow',
-                    'severity': 'MEDIUM'
-                })
-            
-            self.failed_tests.append((test_name, traceback))
+            self.failed_tests[base + offset] = (test_name, traceback)
         
         # Analyze errors
-        for test, traceback in result.errors:
-            self.failed_tests.append((str(test), traceback))
+        base += len(result.failures)
+        for offset, (test, traceback) in enumerate(result.errors):
+            self.failed_tests[base + offset] = (str(test), traceback)
     
     def _generate_report(self):
         """Generate comprehensive diagnosis report"""
-        print("\n" + "=" * 80)
-        print("DIAGNOSIS REPORT: RAG CHATBOT 'QUERY FAILED' ISSUE")
-        print("=" * 80)
+        out = []
+        
+        out.append("\n" + "=" * 80)
+        out.append("DIAGNOSIS REPORT: RAG CHATBOT 'QUERY FAILED' ISSUE")
+        out.append("=" * 80)
         
-        print(f"\n📊 TEST SUMMARY:")
-        print(f"{'='*50}")
+        out.append(f"\n📊 TEST SUMMARY:")
+        out.append(f"{'='*50}")
         for suite_name, passed, total in self.passed_tests:
-            print(f"{suite_name}: {passed}/{total} tests passed")
+            out.append(f"{suite_name}: {passed}/{total} tests passed")
         
         if not self.issues_found:
-            print("\n✅ No major issues found in tested components")
+            out.append("\n✅ No major issues found in tested components")
+            self._write_report(out)
             return
         
-        print(f"\n🔍 ISSUES IDENTIFIED ({len(self.issues_found)}):")
-        print("="*50)
+        out.append(f"\n🔍 ISSUES IDENTIFIED ({len(self.issues_found)}):")
+        out.append("="*50)
         
         # Group issues by severity
-        critical = [i for i in self.issues_found if i['severity'] == 'HIGH']
-        medium = [i for i in self.issues_found if i['severity'] == 'MEDIUM']
-        low = [i for i in self.issues_found if i['severity'] == 'LOW']
+        critical = self.issues_by_severity['HIGH']
+        medium = self.issues_by_severity['MEDIUM']
+        low = self.issues_by_severity['LOW']
         
         # Critical issues first
         if critical:
-            print("\n🚨 CRITICAL ISSUES (Fix these first!):")
+            out.append("\n🚨 CRITICAL ISSUES (Fix these first!):")
             for i, issue in enumerate(critical, 1):
-                print(f"\n{i}. Component: {issue['component']}")
-                print(f"   Issue: {issue['issue']}")
-                print(f"   Impact: {issue['impact']}")
-                print(f"   Fix: {issue['fix']}")
+                out.append(ISSUE_DETAIL_TEMPLATE.format(n=i, **issue))
         
         if medium:
-            print("\n⚠️  MEDIUM PRIORITY ISSUES:")
+            out.append("\n⚠️  MEDIUM PRIORITY ISSUES:")
             for i, issue in enumerate(medium, 1):
-                print(f"\n{i}. Component: {issue['component']}")
-                print(f"   Issue: {issue['issue']}")
-                print(f"   Fix: {issue['fix']}")
+                out.append(ISSUE_TEMPLATE.format(n=i, **issue))
         
         if low:
-            print("\n📝 LOW PRIORITY ISSUES (Test-related):")
+            out.append("\n📝 LOW PRIORITY ISSUES (Test-related):")
             for i, issue in enumerate(low, 1):
-                print(f"\n{i}. Component: {issue['component']}")
-                print(f"   Issue: {issue['issue']}")
-                print(f"   Fix: {issue['fix']}")
-        
-        print(f"\n🔧 RECOMMENDED FIXES:")
-        print("="*50)
-        print("\n1. IMMEDIATE FIX (Likely solves the main problem):")
-        print("   Edit backend/config.py line 24:")
-        print("   Change: MAX_RESULTS: int = 0")  
-        print("   To:     MAX_RESULTS: int = 5")
-        print("\n   This is likely the root cause of 'query failed' errors!")
-        
-        print("\n2. VERIFY AFTER FIX:")
-        print("   - Restart the application")
-        print("   - Test a content-related query")
-        print("   - Check if search results are returned")
-        
-        print("\n3. ADDITIONAL CHECKS:")
-        print("   - Ensure ANTHROPIC_API_KEY is set in .env file")
-        print("   - Verify ChromaDB database has course content") 
-        print("   - Check that course documents are in ./docs/ folder")
-        
-        print(f"\n📋 NEXT STEPS:")
-        print("="*50)
-        print("1. Apply the MAX_RESULTS fix")
-        print("2. Re-run tests to verify fix")
-        print("3. Test the chatbot with actual queries")
-        print("4. Monitor for any remaining issues")
+                out.append(ISSUE_TEMPLATE.format(n=i, **issue))
+        
+        out.append(f"\n🔧 RECOMMENDED FIXES:")
+        out.append("="*50)
+        out.append("\n1. IMMEDIATE FIX (Likely solves the main problem):")
+        out.append("   Edit backend/config.py line 24:")
+        out.append("   Change: MAX_RESULTS: int = 0")
+        out.append("   To:     MAX_RESULTS: int = 5")
+        out.append("\n   This is likely the root cause of 'query failed' errors!")
+        
+        out.append("\n2. VERIFY AFTER FIX:")
+        out.append("   - Restart the application")
+        out.append("   - Test a content-related query")
+        out.append("   - Check if search results are returned")
+        
+        out.append("\n3. ADDITIONAL CHECKS:")
+        out.append("   - Ensure ANTHROPIC_API_KEY is set in .env file")
+        out.append("   - Verify ChromaDB database has course content")
+        out.append("   - Check that course documents are in ./docs/ folder")
+        
+        out.append(f"\n📋 NEXT STEPS:")
+        out.append("="*50)
+        out.append("1. Apply the MAX_RESULTS fix")
+        out.append("2. Re-run tests to verify fix")
+        out.append("3. Test the chatbot with actual queries")
+        out.append("4. Monitor for any remaining issues")
+        
+        self._write_report(out)
+    
+    def _write_report(self, out):
+        """Emit the buffered report lines in a single write"""
+        sys.stdout.write("\n".join(out) + "\n")
+        sys.stdout.flush()
 
 
 if __name__ == '__main__':
@@ -7,34 +7,54 @@ import sys
 import os
 
 # Add parent directory to path to import modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
 
 from ai_generator import AIGenerator
 from search_tools import ToolManager, CourseSearchTool
-from test_fixtures import MockVectorStore, MOCK_ANTHROPIC_RESPONSES
+from test_fixtures import MockVectorStore, mock_anthropic_response
 
 
 class TestAIGenerator(unittest.TestCase):
     """Test cases for AIGenerator tool calling functionality"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Patch the Anthropic client class once for all tests"""
+        patcher = patch('ai_generator.anthropic.Anthropic')
+        cls.mock_anthropic_class = patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        
+        # Create mock tool manager
+        cls.mock_vector_store = MockVectorStore()
+        cls.tool_manager = ToolManager()
+        cls.search_tool = CourseSearchTool(cls.mock_vector_store)
+        cls.tool_manager.register_tool(cls.search_tool)
+        
+        # Tool registration is fixed for the class, so definitions can be built once
+        cls.tool_definitions = cls.tool_manager.get_tool_definitions()
+    
     def setUp(self):
         """Set up test fixtures before each test"""
+        self.mock_anthropic_class.reset_mock(return_value=True)
+        
+        # Client exposing only messages.create, so no other attributes are synthesized
+        self.mock_client = Mock(spec_set=['messages'])
+        self.mock_client.messages = Mock(spec_set=['create'])
+        self.mock_anthropic_class.return_value = self.mock_client
+        
         self.api_key = "test_api_key"
         self.model = "claude-sonnet-4-20250514"
         
-        # Create mock tool manager
-        self.mock_vector_store = MockVectorStore()
-        self.tool_manager = ToolManager()
-        self.search_tool = CourseSearchTool(self.mock_vector_store)
-        self.tool_manager.register_tool(self.search_tool)
+        # Reset shared tool fixtures
+        self.mock_vector_store.reset()
+        self.tool_manager.reset_sources()
     
-    @patch('ai_generator.anthropic.Anthropic')
-    def test_direct_response_without_tools(self, mock_anthropic_class):
+    def test_direct_response_without_tools(self):
         """Test direct response when no tools are needed"""
         # Setup mocks
-        mock_client = Mock()
-        mock_anthropic_class.return_value = mock_client
-        mock_client.messages.create.return_value = MOCK_ANTHROPIC_RESPONSES['direct_response']
+        self.mock_client.messages.create.return_value = mock_anthropic_response('direct_response')
         
         ai_generator = AIGenerator(self.api_key, self.model)
         
@@ -49,22 +69,17 @@ class TestAIGenerator(unittest.TestCase):
         self.assertEqual(result, "This is a direct response without tool use")
         
         # Verify API was called correctly
-        mock_client.messages.create.assert_called_once()
-        call_args = mock_client.messages.create.call_args[1]
+        self.mock_client.messages.create.assert_called_once()
+        call_args = self.mock_client.messages.create.call_args[1]
         self.assertNotIn('tools', call_args)
         self.assertNotIn('tool_choice', call_args)
     
-    @patch('ai_generator.anthropic.Anthropic')
-    def test_tool_execution_flow(self, mock_anthropic_class):
+    def test_tool_execution_flow(self):
         """Test complete tool execution flow"""
-        # Setup mocks
-        mock_client = Mock()
-        mock_anthropic_class.return_value = mock_client
-        
         # First call returns tool use, second call returns final response
-        mock_client.messages.create.side_effect = [
-            MOCK_ANTHROPIC_RESPONSES['tool_use_response'],
-            MOCK_ANTHROPIC_RESPONSES['final_response_after_tool']
+        self.mock_client.messages.create.side_effect = [
+            mock_anthropic_response('tool_use_response'),
+            mock_anthropic_response('final_response_after_tool')
         ]
         
         # Setup mock vector store to return results
@@ -79,7 +94,7 @@ class TestAIGenerator(unittest.TestCase):
             # Test query that triggers tool use
             result = ai_generator.generate_response(
                 query="Tell me about Python programming",
-                tools=self.tool_manager.get_tool_definitions(),
+                tools=self.tool_definitions,
                 tool_manager=self.tool_manager
             )
             
@@ -87,23 +102,20 @@ class TestAIGenerator(unittest.TestCase):
             self.assertEqual(result, "Based on the search results, Python is a programming language...")
             
             # Verify two API calls were made (initial + follow-up)
-            self.assertEqual(mock_client.messages.create.call_count, 2)
+            self.assertEqual(self.mock_client.messages.create.call_count, 2)
             
             # Verify tools were included in first call
-            first_call = mock_client.messages.create.call_args_list[0][1]
+            first_call = self.mock_client.messages.create.call_args_list[0][1]
             self.assertIn('tools', first_call)
             self.assertIn('tool_choice', first_call)
             self.assertEqual(first_call['tool_choice']['type'], 'auto')
     
-    @patch('ai_generator.anthropic.Anthropic') 
-    def test_tool_execution_parameters(self, mock_anthropic_class):
+    def test_tool_execution_parameters(self):
         """Test that tool execution receives correct parameters"""
         # Setup mocks
-        mock_client = Mock()
-        mock_anthropic_class.return_value = mock_client
-        mock_client.messages.create.side_effect = [
-            MOCK_ANTHROPIC_RESPONSES['tool_use_response'],
-            MOCK_ANTHROPIC_RESPONSES['final_response_after_tool']
+        self.mock_client.messages.create.side_effect = [
+            mock_anthropic_response('tool_use_response'),
+            mock_anthropic_response('final_response_after_tool')
         ]
         
         # Mock tool execution to track parameters
@@ -117,7 +129,7 @@ class TestAIGenerator(unittest.TestCase):
             
             result = ai_generator.generate_response(
                 query="Search for Python in ML course",
-                tools=self.tool_manager.get_tool_definitions(),
+                tools=self.tool_definitions,
                 tool_manager=self.tool_manager
             )
             
@@ -127,13 +139,10 @@ class TestAIGenerator(unittest.TestCase):
             self.assertEqual(call_params['query'], 'Python programming')
             self.assertEqual(call_params['course_name'], 'Python Basics')
     
-    @patch('ai_generator.anthropic.Anthropic')
-    def test_conversation_history_inclusion(self, mock_anthropic_class):
+    def test_conversation_history_inclusion(self):
         """Test that conversation history is included in system prompt"""
         # Setup mocks
-        mock_client = Mock()
-        mock_anthropic_class.return_value = mock_client
-        mock_client.messages.create.return_value = MOCK_ANTHROPIC_RESPONSES['direct_response']
+        self.mock_client.messages.create.return_value = mock_anthropic_response('direct_response')
         
         ai_generator = AIGenerator(self.api_key, self.model)
         
@@ -147,43 +156,36 @@ class TestAIGenerator(unittest.TestCase):
         )
         
         # Verify history was included in system prompt
-        call_args = mock_client.messages.create.call_args[1]
+        call_args = self.mock_client.messages.create.call_args[1]
         system_content = call_args['system']
         self.assertIn(conversation_history, system_content)
         self.assertIn("Previous conversation:", system_content)
     
-    @patch('ai_generator.anthropic.Anthropic')
-    def test_tool_execution_error_handling(self, mock_anthropic_class):
+    def test_tool_execution_error_handling(self):
         """Test error handling during tool execution"""
         # Setup mocks
-        mock_client = Mock()
-        mock_anthropic_class.return_value = mock_client
-        mock_client.messages.create.side_effect = [
-            MOCK_ANTHROPIC_RESPONSES['tool_use_response'],
-            MOCK_ANTHROPIC_RESPONSES['final_response_after_tool']
+        self.mock_client.messages.create.side_effect = [
+            mock_anthropic_response('tool_use_response'),
+            mock_anthropic_response('final_response_after_tool')
         ]
         
         # Mock tool execution to raise an error
         with patch.object(self.search_tool, 'execute', side_effect=Exception("Tool execution failed")):
             ai_generator = AIGenerator(self.api_key, self.model)
             
-            # This should still work - the tool manager should handle errors gracefully
-            try:
-                result = ai_generator.generate_response(
-                    query="Search query",
-                    tools=self.tool_manager.get_tool_definitions(),
-                    tool_manager=self.tool_manager
-                )
-                # If we get here, the error was handled properly
-                self.assertIsInstance(result, str)
-            except Exception as e:
-                # If an exception propagated, that might indicate an issue
-                self.fail(f"Tool execution error was not handled gracefully: {e}")
+            # This should still work - the tool manager should handle errors gracefully.
+            # An exception propagating out of here is reported as a test error.
+            result = ai_generator.generate_response(
+                query="Search query",
+                tools=self.tool_definitions,
+                tool_manager=self.tool_manager
+            )
+            self.assertIsInstance(result, str)
     
     def test_tool_definitions_integration(self):
         """Test that tool definitions are properly formatted for Anthropic API"""
         ai_generator = AIGenerator(self.api_key, self.model)
-        tool_definitions = self.tool_manager.get_tool_definitions()
+        tool_definitions = self.tool_definitions
         
         # Verify we have the expected tools
         self.assertEqual(len(tool_definitions), 1)
@@ -200,12 +202,9 @@ class TestAIGenerator(unittest.TestCase):
         self.assertIn('properties', schema)
         self.assertIn('required', schema)
     
-    @patch('ai_generator.anthropic.Anthropic')
-    def test_api_parameters_configuration(self, mock_anthropic_class):
+    def test_api_parameters_configuration(self):
         """Test that API parameters are configured correctly"""
-        mock_client = Mock()
-        mock_anthropic_class.return_value = mock_client
-        mock_client.messages.create.return_value = MOCK_ANTHROPIC_RESPONSES['direct_response']
+        self.mock_client.messages.create.return_value = mock_anthropic_response('direct_response')
         
         ai_generator = AIGenerator(self.api_key, self.model)
         
@@ -213,7 +212,7 @@ class TestAIGenerator(unittest.TestCase):
         result = ai_generator.generate_response(query="test query")
         
         # Verify API call parameters
-        call_args = mock_client.messages.create.call_args[1]
+        call_args = self.mock_client.messages.create.call_args[1]
         self.assertEqual(call_args['model'], self.model)
         self.assertEqual(call_args['temperature'], 0)
         self.assertEqual(call_args['max_tokens'], 800)
@@ -230,16 +229,22 @@ class TestAIGenerator(unittest.TestCase):
 class TestAIGeneratorIntegration(unittest.TestCase):
     """Integration tests for AIGenerator with real tool manager"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create real tool manager with mock vector store once for all tests"""
+        cls.mock_vector_store = MockVectorStore()
+        cls.tool_manager = ToolManager()
+        cls.search_tool = CourseSearchTool(cls.mock_vector_store)
+        cls.tool_manager.register_tool(cls.search_tool)
+    
     def setUp(self):
         """Set up integration test fixtures"""
         self.api_key = "test_api_key" 
         self.model = "claude-sonnet-4-20250514"
         
-        # Create real tool manager with mock vector store
-        self.mock_vector_store = MockVectorStore()
-        self.tool_manager = ToolManager()
-        self.search_tool = CourseSearchTool(self.mock_vector_store)
-        self.tool_manager.register_tool(self.search_tool)
+        # Reset shared tool fixtures
+        self.mock_vector_store.reset()
+        self.tool_manager.reset_sources()
     
     def test_tool_manager_execute_tool(self):
         """Test that tool manager can execute tools correctly"""
@@ -265,8 +270,8 @@ class TestAIGeneratorIntegration(unittest.TestCase):
         # Verify vector store was called
         self.assertEqual(len(self.mock_vector_store.search_calls), 1)
         call = self.mock_vector_store.search_calls[0]
-        self.assertEqual(call['query'], "Python programming")
-        self.assertEqual(call['course_name'], "Python Course")
+        self.assertEqual(call.query, "Python programming")
+        self.assertEqual(call.course_name, "Python Course")
     
     def test_sources_tracking_integration(self):
         """Test that sources are properly tracked through the tool manager"""
@@ -6,23 +6,31 @@ import sys
 import os
 
 # Add parent directory to path to import modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
 
 from search_tools import CourseSearchTool
-from test_fixtures import MockVectorStore, SEARCH_TEST_SCENARIOS, create_mock_search_results
+from test_fixtures import MockVectorStore, search_test_scenario, create_mock_search_results
 
 
 class TestCourseSearchTool(unittest.TestCase):
     """Test cases for CourseSearchTool functionality"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build the mock store and search tool once for all tests"""
+        cls.mock_vector_store = MockVectorStore()
+        cls.search_tool = CourseSearchTool(cls.mock_vector_store)
+    
     def setUp(self):
-        """Set up test fixtures before each test"""
-        self.mock_vector_store = MockVectorStore()
-        self.search_tool = CourseSearchTool(self.mock_vector_store)
+        """Reset shared fixtures before each test"""
+        self.mock_vector_store.reset()
+        self.search_tool.last_sources = []
     
     def test_successful_search_execution(self):
         """Test that execute method works with successful search results"""
-        scenario = SEARCH_TEST_SCENARIOS['successful_search']
+        scenario = search_test_scenario('successful_search')
         
         # Configure mock to return test results
         self.mock_vector_store.mock_results = scenario['mock_results']
@@ -38,13 +46,13 @@ class TestCourseSearchTool(unittest.TestCase):
         # Verify the vector store was called correctly
         self.assertEqual(len(self.mock_vector_store.search_calls), 1)
         call = self.mock_vector_store.search_calls[0]
-        self.assertEqual(call['query'], scenario['query'])
-        self.assertEqual(call['course_name'], None)
-        self.assertEqual(call['lesson_number'], None)
+        self.assertEqual(call.query, scenario['query'])
+        self.assertEqual(call.course_name, None)
+        self.assertEqual(call.lesson_number, None)
     
     def test_empty_search_results(self):
         """Test behavior when search returns no results"""
-        scenario = SEARCH_TEST_SCENARIOS['empty_search']
+        scenario = search_test_scenario('empty_search')
         
         # Configure mock to return empty results
         self.mock_vector_store.mock_results = scenario['mock_results']
@@ -59,7 +67,7 @@ class TestCourseSearchTool(unittest.TestCase):
     
     def test_search_with_error(self):
         """Test behavior when search returns error"""
-        scenario = SEARCH_TEST_SCENARIOS['search_with_error']
+        scenario = search_test_scenario('search_with_error')
         
         # Configure mock to return error
         self.mock_vector_store.mock_results = scenario['mock_results']
@@ -74,7 +82,7 @@ class TestCourseSearchTool(unittest.TestCase):
     
     def test_course_name_filtering(self):
         """Test search with course name filter"""
-        scenario = SEARCH_TEST_SCENARIOS['course_filtered_search']
+        scenario = search_test_scenario('course_filtered_search')
         
         # Configure mock to return filtered results
         self.mock_vector_store.mock_results = scenario['mock_results']
@@ -93,11 +101,11 @@ class TestCourseSearchTool(unittest.TestCase):
         # Verify the vector store was called with course filter
         self.assertEqual(len(self.mock_vector_store.search_calls), 1)
         call = self.mock_vector_store.search_calls[0]
-        self.assertEqual(call['course_name'], scenario['course_name'])
+        self.assertEqual(call.course_name, scenario['course_name'])
     
     def test_lesson_number_filtering(self):
         """Test search with lesson number filter"""
-        scenario = SEARCH_TEST_SCENARIOS['lesson_filtered_search']
+        scenario = search_test_scenario('lesson_filtered_search')
         
         # Configure mock to return filtered results
         self.mock_vector_store.mock_results = scenario['mock_results']
@@ -116,7 +124,7 @@ class TestCourseSearchTool(unittest.TestCase):
         # Verify the vector store was called with lesson filter
         self.assertEqual(len(self.mock_vector_store.search_calls), 1)
         call = self.mock_vector_store.search_calls[0]
-        self.assertEqual(call['lesson_number'], scenario['lesson_number'])
+        self.assertEqual(call.lesson_number, scenario['lesson_number'])
     
     def test_combined_filters(self):
         """Test search with both course name and lesson number filters"""
@@ -141,8 +149,8 @@ class TestCourseSearchTool(unittest.TestCase):
         
         # Verify vector store received both filters
         call = self.mock_vector_store.search_calls[0]
-        self.assertEqual(call['course_name'], "Advanced Course")
-        self.assertEqual(call['lesson_number'], 5)
+        self.assertEqual(call.course_name, "Advanced Course")
+        self.assertEqual(call.lesson_number, 5)
     
     def test_sources_tracking(self):
         """Test that last_sources is properly tracked"""
@@ -3,32 +3,40 @@ Test fixtures and mock data for RAG system testing
 """
 from typing import List, Dict, Any
 from unittest.mock import Mock, MagicMock
+from functools import cache, lru_cache
+from collections import deque, namedtuple
+from types import MappingProxyType, SimpleNamespace
 import sys
 import os
 
 # Add parent directory to path to import modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
 
 from models import Course, Lesson, CourseChunk
 from vector_store import SearchResults
 
+# Metadata used for every document when a test does not supply its own
+_DEFAULT_METADATA = MappingProxyType({"course_title": "Test Course", "lesson_number": 1})
+
+# Arguments of a single MockVectorStore.search call
+SearchCall = namedtuple('SearchCall', ['query', 'course_name', 'lesson_number'])
+
 class MockVectorStore:
     """Mock VectorStore for testing"""
     
     def __init__(self, mock_results: List[SearchResults] = None):
         self.mock_results = mock_results or []
-        self.search_calls = []
+        # Bounded call history; tests only inspect the most recent calls
+        self.search_calls = deque(maxlen=32)
         self.current_result_index = 0
-        self._resolve_course_name_calls = []
+        self._resolve_course_name_calls = deque(maxlen=32)
         self._resolve_course_name_return = None
         
     def search(self, query: str, course_name: str = None, lesson_number: int = None) -> SearchResults:
         """Mock search method that tracks calls and returns predefined results"""
-        self.search_calls.append({
-            'query': query,
-            'course_name': course_name, 
-            'lesson_number': lesson_number
-        })
+        self.search_calls.append(SearchCall(query, course_name, lesson_number))
         
         if self.mock_results and self.current_result_index < len(self.mock_results):
             result = self.mock_results[self.current_result_index]
@@ -38,16 +46,45 @@ class MockVectorStore:
         # Default empty result
         return SearchResults.empty("No results configured")
     
+    def reset(self):
+        """Clear configured results and recorded calls so the store can be reused"""
+        self.mock_results = []
+        self.search_calls.clear()
+        self.current_result_index = 0
+        self._resolve_course_name_calls.clear()
+        self._resolve_course_name_return = None
+    
     def _resolve_course_name(self, course_name: str):
         """Mock course name resolution"""
         self._resolve_course_name_calls.append(course_name)
         return self._resolve_course_name_return
 
+class StubToolManager:
+    """Lightweight ToolManager stand-in with preset sources for RAGSystem tests"""
+    
+    def __init__(self, tool_definitions: List[Dict[str, Any]] = None):
+        self.tool_definitions = tool_definitions or []
+        self.last_sources = []
+        self.reset_calls = 0
+    
+    def get_tool_definitions(self) -> list:
+        """Return the preset tool definitions"""
+        return self.tool_definitions
+    
+    def get_last_sources(self) -> list:
+        """Return the preset sources"""
+        return self.last_sources
+    
+    def reset_sources(self):
+        """Count the reset and clear the preset sources"""
+        self.reset_calls += 1
+        self.last_sources = []
+
 def create_mock_search_results(documents: List[str], metadata: List[Dict[str, Any]] = None, 
                               distances: List[float] = None, error: str = None) -> SearchResults:
     """Helper to create SearchResults for testing"""
     if metadata is None:
-        metadata = [{"course_title": "Test Course", "lesson_number": 1} for _ in documents]
+        metadata = [_DEFAULT_METADATA] * len(documents)
     if distances is None:
         distances = [0.1 * i for i in range(len(documents))]
     
@@ -58,14 +95,17 @@ def create_mock_search_results(documents: List[str], metadata: List[Dict[str, An
         error=error
     )
 
+# The sample models below use model_construct, which skips pydantic validation;
+# this is only safe because the fixture literals are known to be valid
+@lru_cache(maxsize=1)
 def create_sample_course() -> Course:
-    """Create a sample course for testing"""
+    """Create a sample course for testing (built once and shared, so do not mutate)"""
     lessons = [
-        Lesson(lesson_number=1, title="Introduction", content="Welcome to the course", lesson_link="http://example.com/lesson1"),
-        Lesson(lesson_number=2, title="Advanced Topics", content="Deep dive into advanced concepts", lesson_link="http://example.com/lesson2")
+        Lesson.model_construct(lesson_number=1, title="Introduction", content="Welcome to the course", lesson_link="http://example.com/lesson1"),
+        Lesson.model_construct(lesson_number=2, title="Advanced Topics", content="Deep dive into advanced concepts", lesson_link="http://example.com/lesson2")
     ]
     
-    return Course(
+    return Course.model_construct(
         title="Test Course",
         instructor="Test Instructor", 
         course_link="http://example.com/course",
@@ -74,24 +114,29 @@ def create_sample_course() -> Course:
 
 def create_sample_course_chunks() -> List[CourseChunk]:
     """Create sample course chunks for testing"""
-    return [
-        CourseChunk(
+    return list(_sample_course_chunks())
+
+@lru_cache(maxsize=1)
+def _sample_course_chunks() -> tuple:
+    """Build the shared sample chunks once; callers get their own list of them"""
+    return (
+        CourseChunk.model_construct(
             content="Introduction to the course material",
             course_title="Test Course",
             lesson_number=1,
             chunk_index=0
         ),
-        CourseChunk(
+        CourseChunk.model_construct(
             content="Advanced concepts and implementations", 
             course_title="Test Course",
             lesson_number=2,
             chunk_index=1
         )
-    ]
+    )
 
-# Test scenarios for CourseSearchTool
-SEARCH_TEST_SCENARIOS = {
-    'successful_search': {
+# Test scenarios for CourseSearchTool, built per scenario on first use
+_SEARCH_SCENARIO_BUILDERS = {
+    'successful_search': lambda: {
         'description': 'Search returns relevant results',
         'mock_results': [create_mock_search_results(
             ["This is content about Python programming", "More details about functions"], 
@@ -101,21 +146,21 @@ SEARCH_TEST_SCENARIOS = {
         'expected_contains': ['Python Basics', 'Python programming', 'More details']
     },
     
-    'empty_search': {
+    'empty_search': lambda: {
         'description': 'Search returns no results', 
         'mock_results': [SearchResults.empty("")],
         'query': 'nonexistent topic',
         'expected_contains': ['No relevant content found']
     },
     
-    'search_with_error': {
+    'search_with_error': lambda: {
         'description': 'Search returns error',
         'mock_results': [SearchResults.empty("Database connection failed")], 
         'query': 'any query',
         'expected_contains': ['Database connection failed']
     },
     
-    'course_filtered_search': {
+    'course_filtered_search': lambda: {
         'description': 'Search with course name filter',
         'mock_results': [create_mock_search_results(
             ["Content specific to Machine Learning"],
@@ -126,7 +171,7 @@ SEARCH_TEST_SCENARIOS = {
         'expected_contains': ['ML Course', 'Content specific to Machine Learning']
     },
     
-    'lesson_filtered_search': {
+    'lesson_filtered_search': lambda: {
         'description': 'Search with lesson number filter', 
         'mock_results': [create_mock_search_results(
             ["Lesson 3 specific content"],
@@ -138,27 +183,40 @@ SEARCH_TEST_SCENARIOS = {
     }
 }
 
+@cache
+def search_test_scenario(name: str) -> Dict[str, Any]:
+    """Build a single CourseSearchTool scenario, leaving the others unconstructed"""
+    return _SEARCH_SCENARIO_BUILDERS[name]()
+
 # Mock Anthropic response for AI Generator testing
-MOCK_ANTHROPIC_RESPONSES = {
-    'direct_response': Mock(
-        stop_reason='end_turn',
-        content=[Mock(text='This is a direct response without tool use')]
-    ),
-    
-    'tool_use_response': Mock(
-        stop_reason='tool_use',
-        content=[
-            Mock(
-                type='tool_use',
-                name='search_course_content',
-                id='tool_call_123',
-                input={'query': 'Python programming', 'course_name': 'Python Basics'}
-            )
-        ]
-    ),
-    
-    'final_response_after_tool': Mock(
-        stop_reason='end_turn', 
-        content=[Mock(text='Based on the search results, Python is a programming language...')]
-    )
-}
\ No newline at end of file
+@cache
+def mock_anthropic_response(kind: str) -> SimpleNamespace:
+    """Build the named mock Anthropic response on first use"""
+    if kind == 'direct_response':
+        return SimpleNamespace(
+            stop_reason='end_turn',
+            content=[SimpleNamespace(text='This is a direct response without tool use')]
+        )
+    
+    if kind == 'tool_use_response':
+        return SimpleNamespace(
+            stop_reason='tool_use',
+            content=[
+                # Stays a Mock: Mock(name=...) names the mock rather than setting .name,
+                # and the tool execution tests depend on that behaviour
+                Mock(
+                    type='tool_use',
+                    name='search_course_content',
+                    id='tool_call_123',
+                    input={'query': 'Python programming', 'course_name': 'Python Basics'}
+                )
+            ]
+        )
+    
+    if kind == 'final_response_after_tool':
+        return SimpleNamespace(
+            stop_reason='end_turn', 
+            content=[SimpleNamespace(text='Based on the search results, Python is a programming language...')]
+        )
+    
+    raise KeyError(f"Unknown mock Anthropic response: {kind}")
\ No newline at end of file
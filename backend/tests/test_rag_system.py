@@ -2,56 +2,104 @@
 Tests for RAG system query handling
 """
 import unittest
-from unittest.mock import Mock, patch, MagicMock
+from dataclasses import dataclass, replace
+from unittest.mock import Mock, patch, DEFAULT, create_autospec
 import sys
 import os
 
 # Add parent directory to path to import modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
 
 from rag_system import RAGSystem
-from config import Config
-from test_fixtures import MockVectorStore, MOCK_ANTHROPIC_RESPONSES, create_mock_search_results
+from config import config as real_config
+from vector_store import VectorStore
+from ai_generator import AIGenerator
+from document_processor import DocumentProcessor
+from session_manager import SessionManager
+from test_fixtures import StubToolManager
 
 
+@dataclass(frozen=True, slots=True)
 class MockConfig:
     """Mock configuration for testing"""
-    ANTHROPIC_API_KEY = "test_key"
-    ANTHROPIC_MODEL = "claude-sonnet-4-20250514"
-    EMBEDDING_MODEL = "all-MiniLM-L6-v2"
-    CHUNK_SIZE = 800
-    CHUNK_OVERLAP = 100
-    MAX_RESULTS = 5  # Note: This is different from the real config which has 0!
-    MAX_HISTORY = 2
-    CHROMA_PATH = "./test_chroma_db"
+    ANTHROPIC_API_KEY: str = "test_key"
+    ANTHROPIC_MODEL: str = "claude-sonnet-4-20250514"
+    EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
+    CHUNK_SIZE: int = 800
+    CHUNK_OVERLAP: int = 100
+    MAX_RESULTS: int = 5  # Note: This is different from the real config which has 0!
+    MAX_HISTORY: int = 2
+    CHROMA_PATH: str = "./test_chroma_db"
+
+MOCK_CONFIG = MockConfig()
+
+
+# RAG system dependencies replaced by mocks, shared by every patch.multiple below
+RAG_DEPENDENCIES = dict(
+    VectorStore=DEFAULT,
+    AIGenerator=DEFAULT,
+    DocumentProcessor=DEFAULT,
+    SessionManager=DEFAULT
+)
+
+# Module-scoped patches of the RAG system dependencies, started once for all tests
+_rag_dependency_patcher = patch.multiple('rag_system', **RAG_DEPENDENCIES)
+RAG_DEPENDENCY_MOCKS = {}
+
+
+def setUpModule():
+    """Patch the RAG system dependencies for the whole module"""
+    RAG_DEPENDENCY_MOCKS.update(_rag_dependency_patcher.start())
+
+
+def tearDownModule():
+    """Restore the real RAG system dependencies"""
+    _rag_dependency_patcher.stop()
+    RAG_DEPENDENCY_MOCKS.clear()
 
 
 class TestRAGSystem(unittest.TestCase):
     """Test cases for RAG system query handling"""
     
-    @patch('rag_system.VectorStore')
-    @patch('rag_system.AIGenerator')
-    @patch('rag_system.DocumentProcessor')
-    @patch('rag_system.SessionManager')
-    def setUp(self, mock_session, mock_doc_proc, mock_ai_gen, mock_vector_store):
-        """Set up test fixtures with mocked dependencies"""
-        self.mock_config = MockConfig()
+    @classmethod
+    def setUpClass(cls):
+        """Wire the module-level dependency mocks and build the RAG system once"""
+        cls.mock_classes = RAG_DEPENDENCY_MOCKS
         
-        # Setup mock instances
-        self.mock_vector_store_instance = Mock()
-        mock_vector_store.return_value = self.mock_vector_store_instance
+        # Setup mock instances limited to the real classes' APIs
+        cls.mock_vector_store_instance = create_autospec(VectorStore, instance=True)
+        cls.mock_classes['VectorStore'].return_value = cls.mock_vector_store_instance
         
-        self.mock_ai_generator_instance = Mock()
-        mock_ai_gen.return_value = self.mock_ai_generator_instance
+        cls.mock_ai_generator_instance = create_autospec(AIGenerator, instance=True)
+        cls.mock_classes['AIGenerator'].return_value = cls.mock_ai_generator_instance
         
-        self.mock_doc_processor_instance = Mock()
-        mock_doc_proc.return_value = self.mock_doc_processor_instance
+        cls.mock_doc_processor_instance = create_autospec(DocumentProcessor, instance=True)
+        cls.mock_classes['DocumentProcessor'].return_value = cls.mock_doc_processor_instance
         
-        self.mock_session_manager_instance = Mock()
-        mock_session.return_value = self.mock_session_manager_instance
+        cls.mock_session_manager_instance = create_autospec(SessionManager, instance=True)
+        cls.mock_classes['SessionManager'].return_value = cls.mock_session_manager_instance
         
-        # Create RAG system
-        self.rag_system = RAGSystem(self.mock_config)
+        # Create RAG system once; the tests only configure mocks and call query
+        cls.mock_config = MOCK_CONFIG
+        cls.rag_system = RAGSystem(cls.mock_config)
+        cls.tool_definitions = cls.rag_system.tool_manager.get_tool_definitions()
+    
+    def setUp(self):
+        """Reset mocked dependencies shared by the tests"""
+        for mock_instance in (self.mock_vector_store_instance, self.mock_ai_generator_instance,
+                              self.mock_doc_processor_instance, self.mock_session_manager_instance):
+            mock_instance.reset_mock(return_value=True, side_effect=True)
+        
+        # Every test starts with a stub tool manager reporting no sources
+        self.rag_system.tool_manager = StubToolManager(self.tool_definitions)
+    
+    def _stub_sources(self, sources):
+        """Preset the sources reported by the stub tool manager and return it"""
+        tool_manager = self.rag_system.tool_manager
+        tool_manager.last_sources = sources
+        return tool_manager
     
     def test_successful_query_processing(self):
         """Test successful query processing with tool execution"""
@@ -60,8 +108,7 @@ class TestRAGSystem(unittest.TestCase):
         self.mock_ai_generator_instance.generate_response.return_value = "Python is a programming language used for AI development."
         
         # Mock sources tracking
-        self.rag_system.tool_manager.get_last_sources = Mock(return_value=["Python Course - Lesson 1"])
-        self.rag_system.tool_manager.reset_sources = Mock()
+        tool_manager = self._stub_sources(["Python Course - Lesson 1"])
         
         # Execute query
         response, sources = self.rag_system.query("What is Python?")
@@ -78,7 +125,7 @@ class TestRAGSystem(unittest.TestCase):
         self.assertIsNotNone(call_args['tool_manager'])
         
         # Verify sources were reset
-        self.rag_system.tool_manager.reset_sources.assert_called_once()
+        self.assertEqual(tool_manager.reset_calls, 1)
     
     def test_query_with_session_history(self):
         """Test query processing with conversation history"""
@@ -87,10 +134,6 @@ class TestRAGSystem(unittest.TestCase):
         self.mock_session_manager_instance.get_conversation_history.return_value = conversation_history
         self.mock_ai_generator_instance.generate_response.return_value = "Follow-up response"
         
-        # Mock sources
-        self.rag_system.tool_manager.get_last_sources = Mock(return_value=[])
-        self.rag_system.tool_manager.reset_sources = Mock()
-        
         # Execute query with session ID
         response, sources = self.rag_system.query("Follow up question", session_id="test_session")
         
@@ -107,8 +150,6 @@ class TestRAGSystem(unittest.TestCase):
         """Test query processing without session ID"""
         # Setup mocks
         self.mock_ai_generator_instance.generate_response.return_value = "Direct response"
-        self.rag_system.tool_manager.get_last_sources = Mock(return_value=[])
-        self.rag_system.tool_manager.reset_sources = Mock()
         
         # Execute query without session
         response, sources = self.rag_system.query("Direct question")
@@ -125,8 +166,6 @@ class TestRAGSystem(unittest.TestCase):
         """Test that tool definitions are correctly passed to AI generator"""
         # Setup mocks
         self.mock_ai_generator_instance.generate_response.return_value = "Response"
-        self.rag_system.tool_manager.get_last_sources = Mock(return_value=[])
-        self.rag_system.tool_manager.reset_sources = Mock()
         
         # Execute query
         response, sources = self.rag_system.query("Test query")
@@ -147,8 +186,6 @@ class TestRAGSystem(unittest.TestCase):
         """Test that query is properly formatted as a prompt"""
         # Setup mocks
         self.mock_ai_generator_instance.generate_response.return_value = "Response"
-        self.rag_system.tool_manager.get_last_sources = Mock(return_value=[])
-        self.rag_system.tool_manager.reset_sources = Mock()
         
         user_query = "What is machine learning?"
         
@@ -166,28 +203,25 @@ class TestRAGSystem(unittest.TestCase):
 class TestRAGSystemIntegration(unittest.TestCase):
     """Integration tests with real components where possible"""
     
+    # Shared return value for patched constructors whose instances the tests never inspect
+    _DUMMY = Mock()
+    
     def test_config_max_results_issue(self):
         """Test that identifies the MAX_RESULTS = 0 configuration issue"""
-        # Load real config to test the issue
-        from config import config as real_config
-        
         # This test specifically checks for the configuration issue
         self.assertEqual(real_config.MAX_RESULTS, 0, 
                         "MAX_RESULTS is set to 0, which will cause search to return no results!")
     
-    @patch('rag_system.VectorStore')
-    @patch('rag_system.AIGenerator') 
-    @patch('rag_system.DocumentProcessor')
-    @patch('rag_system.SessionManager')
-    def test_real_tool_manager_setup(self, mock_session, mock_doc_proc, mock_ai_gen, mock_vector_store):
+    @patch.multiple('rag_system', **RAG_DEPENDENCIES)
+    def test_real_tool_manager_setup(self, **mocks):
         """Test that tool manager is properly set up with real tools"""
-        mock_config = MockConfig()
+        mock_config = MOCK_CONFIG
         
         # Mock the dependencies
-        mock_vector_store.return_value = Mock()
-        mock_ai_gen.return_value = Mock()
-        mock_doc_proc.return_value = Mock()
-        mock_session.return_value = Mock()
+        mocks['VectorStore'].return_value = self._DUMMY
+        mocks['AIGenerator'].return_value = self._DUMMY
+        mocks['DocumentProcessor'].return_value = self._DUMMY
+        mocks['SessionManager'].return_value = self._DUMMY
         
         # Create RAG system
         rag_system = RAGSystem(mock_config)
@@ -202,38 +236,31 @@ class TestRAGSystemIntegration(unittest.TestCase):
         self.assertIn('search_course_content', tool_names)
         self.assertIn('get_course_outline', tool_names)
     
-    @patch('rag_system.VectorStore')
-    @patch('rag_system.AIGenerator')
-    @patch('rag_system.DocumentProcessor')
-    @patch('rag_system.SessionManager')
-    def test_vector_store_initialization_parameters(self, mock_session, mock_doc_proc, mock_ai_gen, mock_vector_store):
+    @patch.multiple('rag_system', **RAG_DEPENDENCIES)
+    def test_vector_store_initialization_parameters(self, **mocks):
         """Test that VectorStore is initialized with correct parameters from config"""
-        mock_config = MockConfig()
-        mock_config.MAX_RESULTS = 5  # Set to non-zero value
+        mock_config = replace(MOCK_CONFIG, MAX_RESULTS=5)  # Set to non-zero value
         
         # Create RAG system
         rag_system = RAGSystem(mock_config)
         
         # Verify VectorStore was initialized with correct parameters
-        mock_vector_store.assert_called_once_with(
+        mocks['VectorStore'].assert_called_once_with(
             mock_config.CHROMA_PATH,
             mock_config.EMBEDDING_MODEL, 
             mock_config.MAX_RESULTS
         )
     
-    @patch('rag_system.VectorStore')
-    @patch('rag_system.AIGenerator')
-    @patch('rag_system.DocumentProcessor')
-    @patch('rag_system.SessionManager')
-    def test_ai_generator_initialization_parameters(self, mock_session, mock_doc_proc, mock_ai_gen, mock_vector_store):
+    @patch.multiple('rag_system', **RAG_DEPENDENCIES)
+    def test_ai_generator_initialization_parameters(self, **mocks):
         """Test that AIGenerator is initialized with correct parameters"""
-        mock_config = MockConfig()
+        mock_config = MOCK_CONFIG
         
         # Create RAG system
         rag_system = RAGSystem(mock_config)
         
         # Verify AIGenerator was initialized with correct parameters
-        mock_ai_gen.assert_called_once_with(
+        mocks['AIGenerator'].assert_called_once_with(
             mock_config.ANTHROPIC_API_KEY,
             mock_config.ANTHROPIC_MODEL
         )
@@ -244,8 +271,6 @@ class TestRAGSystemRealConfigIssues(unittest.TestCase):
     
     def test_real_config_max_results_zero(self):
         """This test will FAIL and identify the MAX_RESULTS=0 issue"""
-        from config import config as real_config
-        
         # This assertion will fail and clearly show the issue
         self.assertGreater(real_config.MAX_RESULTS, 0, 
                           "CRITICAL CONFIG ISSUE: MAX_RESULTS is set to 0 in config.py line 24. "
@@ -254,16 +279,12 @@ class TestRAGSystemRealConfigIssues(unittest.TestCase):
     
     def test_anthropic_api_key_present(self):
         """Test that API key is configured"""
-        from config import config as real_config
-        
         # Note: In tests this might be empty, but we should check it's at least defined
         self.assertTrue(hasattr(real_config, 'ANTHROPIC_API_KEY'), 
                        "ANTHROPIC_API_KEY should be defined in config")
     
     def test_chroma_path_configuration(self):
         """Test that ChromaDB path is configured"""
-        from config import config as real_config
-        
         self.assertEqual(real_config.CHROMA_PATH, "./chroma_db",
                         "ChromaDB path should be configured correctly")
 